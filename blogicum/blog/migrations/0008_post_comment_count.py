@@ -0,0 +1,32 @@
+# Generated by Django 5.1.1 on 2026-10-15 22:01
+
+from django.db import migrations, models
+
+
+def fill_comment_count(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Comments = apps.get_model('blog', 'Comments')
+    comments = Comments.objects.filter(
+        post=models.OuterRef('pk')
+    ).order_by().values('post').annotate(c=models.Count('*')).values('c')
+    Post.objects.update(
+        comment_count=models.functions.Coalesce(
+            models.Subquery(comments), 0
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_post_pubdate_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество комментариев'),
+        ),
+        migrations.RunPython(fill_comment_count, migrations.RunPython.noop),
+    ]
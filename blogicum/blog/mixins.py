@@ -1,12 +1,33 @@
-from django.contrib.auth.mixins import UserPassesTestMixin
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import Http404
 from django.shortcuts import redirect
 
 
-class OnlyAuthorMixin(UserPassesTestMixin):
+class NotAuthorError(Exception):
+    pass
 
-    def test_func(self):
-        object = self.get_object()
-        return object.author == self.request.user
 
-    def handle_no_permission(self):
-        return redirect('blog:post_detail', pk=self.get_object().pk)
+class OnlyAuthorMixin(LoginRequiredMixin):
+    # Чужой пост отсекается фильтром в get_queryset, так что get_object
+    # делает один запрос. Лишний запрос нужен только для отказа: отличить
+    # чужой пост (редирект на него) от несуществующего (404).
+
+    def get_queryset(self):
+        return super().get_queryset().filter(author=self.request.user)
+
+    def get_object(self, queryset=None):
+        try:
+            return super().get_object(queryset)
+        except Http404:
+            pk = self.kwargs[self.pk_url_kwarg]
+            if self.model.objects.filter(pk=pk).exists():
+                raise NotAuthorError
+            raise
+
+    def dispatch(self, request, *args, **kwargs):
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        except NotAuthorError:
+            return redirect(
+                'blog:post_detail', pk=self.kwargs[self.pk_url_kwarg]
+            )
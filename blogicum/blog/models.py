@@ -85,17 +85,45 @@ class Post(BaseModel):
                               upload_to='post_images',
                               blank=True
                               )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество комментариев'
+    )
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
-        # Не добавляю сюда сортировку, так как при применении annotate во
-        # вьюшке сортировка ломается. Соответственно , сортировку применил
-        # во вьюшке
+        indexes = [
+            models.Index(
+                fields=['-pub_date', '-id'],
+                name='post_pubdate_desc',
+                condition=models.Q(is_published=True),
+            ),
+            models.Index(
+                fields=['author', '-pub_date', '-id'],
+                name='post_author_pubdate_desc',
+            ),
+        ]
+        # Сортировку по дате задают выборки во вьюшках и KeysetPaginator.
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # comment_count меняют только сигналы комментариев через F(), поэтому
+        # при обновлении поста не записываем загруженное в память значение.
+        if (not self._state.adding and self.pk is not None
+                and kwargs.get('update_fields') is None):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.attname not in deferred
+                and field.name != 'comment_count'
+            ]
+        super().save(*args, **kwargs)
+
 
 class Comments(models.Model):
     text = models.TextField('Комментарии')
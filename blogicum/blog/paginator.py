@@ -0,0 +1,119 @@
+import datetime
+import hashlib
+from collections.abc import Sequence
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+POSTS_CACHE_TIMEOUT = 300
+POSTS_CACHE_VERSION_KEY = 'vis:version'
+
+
+def cached_posts(queryset):
+    # Страница ленты кешируется по хешу SQL. Вместо удаления ключей по
+    # шаблону сигналы увеличивают версию, и старые ключи просто истекают.
+    version = cache.get_or_set(POSTS_CACHE_VERSION_KEY, 1, None)
+    key = 'vis:{}:{}'.format(
+        version, hashlib.md5(str(queryset.query).encode()).hexdigest()
+    )
+    return cache.get_or_set(key, lambda: list(queryset), POSTS_CACHE_TIMEOUT)
+
+
+def invalidate_cached_posts():
+    try:
+        cache.incr(POSTS_CACHE_VERSION_KEY)
+    except ValueError:
+        cache.set(POSTS_CACHE_VERSION_KEY, 1, None)
+
+
+class KeysetPage(Sequence):
+
+    def __init__(self, object_list, has_next, has_previous):
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    def next_page_query(self):
+        return self._cursor_query('before', self.object_list[-1])
+
+    def previous_page_query(self):
+        return self._cursor_query('after', self.object_list[0])
+
+    @staticmethod
+    def _cursor_query(direction, post):
+        return urlencode({
+            direction: post.pub_date.isoformat(),
+            'tiebreak': post.pk,
+        })
+
+
+class KeysetPaginator:
+    # Постраничный вывод по курсору (pub_date, pk): вместо OFFSET и COUNT(*)
+    # берём per_page + 1 строк после курсора, лишняя строка говорит о том,
+    # что есть следующая страница.
+
+    def __init__(self, queryset, per_page):
+        self.queryset = queryset
+        self.per_page = per_page
+
+    def get_page(self, params):
+        before = self._get_cursor(params, 'before')
+        after = self._get_cursor(params, 'after')
+        if after:
+            pub_date, pk = after
+            queryset = self.queryset.filter(
+                Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, pk__gt=pk)
+            ).order_by('pub_date', 'pk')
+        else:
+            queryset = self.queryset.order_by('-pub_date', '-pk')
+            if before:
+                pub_date, pk = before
+                queryset = queryset.filter(
+                    Q(pub_date__lt=pub_date)
+                    | Q(pub_date=pub_date, pk__lt=pk)
+                )
+        posts = cached_posts(queryset[:self.per_page + 1])
+        has_more = len(posts) > self.per_page
+        posts = posts[:self.per_page]
+        if not posts and (before or after):
+            # Курсор устарел или указывает за край ленты: показываем начало.
+            return self.get_page({})
+        if after:
+            posts.reverse()
+            return KeysetPage(posts, has_next=True, has_previous=has_more)
+        return KeysetPage(posts, has_next=has_more,
+                          has_previous=bool(before))
+
+    @staticmethod
+    def _get_cursor(params, direction):
+        # Курсор приходит из строки запроса: любое некорректное значение
+        # считаем отсутствием курсора, а не ошибкой сервера.
+        try:
+            pub_date = parse_datetime(params.get(direction, ''))
+            if pub_date is None:
+                return None
+            if timezone.is_naive(pub_date):
+                pub_date = timezone.make_aware(pub_date)
+            pub_date = pub_date.astimezone(datetime.timezone.utc)
+            pk = int(params.get('tiebreak', ''))
+        except (ValueError, OverflowError):
+            return None
+        return pub_date, pk
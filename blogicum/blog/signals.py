@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Category, Comments, Location, Post
+from .paginator import invalidate_cached_posts
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_save, sender=Comments)
+@receiver(post_delete, sender=Comments)
+def reset_cached_posts(sender, **kwargs):
+    # Сразу сбрасываем для чтений внутри той же транзакции, а после коммита —
+    # ещё раз: запрос, пришедший до коммита, мог закешировать старые строки
+    # уже под новой версией.
+    invalidate_cached_posts()
+    transaction.on_commit(invalidate_cached_posts)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def reset_cached_posts_for_user(sender, update_fields=None, **kwargs):
+    # В закешированных лентах есть имя автора. Вход пользователя обновляет
+    # только last_login — из-за этого ленту не сбрасываем.
+    if update_fields and set(update_fields) == {'last_login'}:
+        return
+    reset_cached_posts(sender)
+
+
+def change_comment_count(post_id, delta):
+    posts = Post.objects.filter(pk=post_id)
+    if delta < 0:
+        # Счётчик не уходит ниже нуля, даже если он уже разошёлся с данными.
+        posts = posts.filter(comment_count__gt=0)
+    posts.update(comment_count=F('comment_count') + delta)
+
+
+@receiver(pre_save, sender=Comments)
+def remember_comment_post(sender, instance, raw, **kwargs):
+    if raw or instance.pk is None:
+        return
+    instance._old_post_id = Comments.objects.filter(
+        pk=instance.pk
+    ).values_list('post_id', flat=True).first()
+
+
+@receiver(post_save, sender=Comments)
+def update_comment_count(sender, instance, created, raw, **kwargs):
+    # При loaddata счётчик уже лежит в фикстуре поста.
+    if raw:
+        return
+    if created:
+        change_comment_count(instance.post_id, 1)
+        return
+    old_post_id = getattr(instance, '_old_post_id', None)
+    if old_post_id is not None and old_post_id != instance.post_id:
+        change_comment_count(old_post_id, -1)
+        change_comment_count(instance.post_id, 1)
+
+
+@receiver(post_delete, sender=Comments)
+def decrease_comment_count(sender, instance, **kwargs):
+    change_comment_count(instance.post_id, -1)
@@ -10,7 +10,7 @@ urlpatterns = [
          name='post_detail'
          ),
     path('category/<slug:category_slug>/',
-         views.category_posts, name='category_posts'),
+         views.CategoryPostsView.as_view(), name='category_posts'),
     path('profile/<str:username>/', views.profile, name='profile'),
     path('edit_profile/', views.edit_profile, name='edit_profile'),
     path('posts/<int:post_id>/comment/', views.add_comment,
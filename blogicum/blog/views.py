@@ -1,15 +1,15 @@
-import datetime
-
 from django.shortcuts import get_object_or_404, render, redirect
 from django.views.generic import (
     CreateView, DeleteView, DetailView, ListView, UpdateView
 )
 from django.contrib.auth.models import User
-from django.core.paginator import Paginator
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Q, Count
+from django.db.models import Prefetch, Q
 from django.contrib.auth.decorators import login_required
+from django.http import Http404
 from django.urls import reverse_lazy, reverse
+from django.utils import timezone
+from django.views.decorators.http import require_POST
 # Если убрать reverse_lazy, то у меня ломается PostDeleteView.
 # Pytest тоже не проходит.
 # Происходит циклический импорт и на момент импорта, urls.py ещё не загружены.
@@ -17,49 +17,56 @@ from django.urls import reverse_lazy, reverse
 from blog.models import Post, Category, Comments
 from .forms import CommentsForm, PostForm, ProfileEditForm
 from .mixins import OnlyAuthorMixin
+from .paginator import KeysetPaginator
 
 MAX_POSTS_ON_PAGE = 10
+PUBLISHED_POSTS = Q(is_published=True, category__is_published=True)
 
 
 def base_posts():
+    # Берём только поля, которые выводятся в карточке поста: без описания
+    # категории и строки пользователя целиком.
     return Post.objects.select_related(
-        'category', 'location'
-    ).annotate(comment_count=Count('comments')).order_by('-pub_date')
+        'category', 'location', 'author'
+    ).only(
+        'id', 'title', 'text', 'pub_date', 'image', 'is_published',
+        'comment_count', 'author__username',
+        'category__title', 'category__slug', 'category__is_published',
+        'location__name', 'location__is_published',
+    ).order_by('-pub_date')
 
 
-def get_visible_posts():
-    return base_posts().filter(
-        is_published=True,
-        pub_date__lte=datetime.datetime.now(),
-        category__is_published=True)
+def published_now():
+    # Округляем до минуты: SQL ленты не меняется в течение минуты.
+    return timezone.now().replace(second=0, microsecond=0)
 
 
-def visible_to_user(user, author):
-    # Не совсем понял как нужно было сделать через get_visible_posts()
-    # поэтому сделал немного подругому.
-    if user == author:
-        return base_posts()
-    elif user.is_authenticated:
-        return base_posts().filter(
-            Q(is_published=True, pub_date__lte=datetime.datetime.now(),
-              category__is_published=True) | Q(author=user))
-    return get_visible_posts()
+def published_q(now=None):
+    # Без now берём время, округлённое до минуты, — для кешируемых лент.
+    return PUBLISHED_POSTS & Q(pub_date__lte=now or published_now())
+
+
+def get_visible_posts():
+    return base_posts().filter(published_q())
 
 
 def make_paginate(request, post):
-    paginator = Paginator(post, MAX_POSTS_ON_PAGE)
-    page_number = request.GET.get('page')
-    return paginator.get_page(page_number)
+    paginator = KeysetPaginator(post, MAX_POSTS_ON_PAGE)
+    return paginator.get_page(request.GET)
 
 
 class IndexListView(ListView):
     model = Post
     template_name = 'blog/index.html'
     paginate_by = MAX_POSTS_ON_PAGE
-    objects = get_visible_posts()
 
     def get_queryset(self):
-        return self.objects
+        return get_visible_posts()
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(queryset, page_size)
+        page = paginator.get_page(self.request.GET)
+        return paginator, page, page.object_list, page.has_other_pages()
 
 
 class PostDetailView(DetailView):
@@ -68,52 +75,60 @@ class PostDetailView(DetailView):
     context_object_name = 'post'
 
     def get_object(self, queryset=None):
-        post = get_object_or_404(self.model, id=self.kwargs[self.pk_url_kwarg])
-        if post.author == self.request.user:
-            return post
+        visible = published_q(timezone.now())
+        if self.request.user.is_authenticated:
+            visible |= Q(author=self.request.user)
         return get_object_or_404(
-            visible_to_user(self.request.user, post.author),
-            id=self.kwargs[self.pk_url_kwarg],
+            Post.objects.select_related(
+                'category', 'location', 'author'
+            ).prefetch_related(
+                Prefetch(
+                    'comments',
+                    queryset=Comments.objects.select_related(
+                        'author'
+                    ).only(
+                        'id', 'text', 'created_at', 'post', 'author__username'
+                    ).order_by('created_at')
+                )
+            ).filter(visible),
+            pk=self.kwargs[self.pk_url_kwarg],
         )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentsForm()
-        context['comments'] = (
-            self.object.comments.select_related('author')
-        )
+        context['comments'] = self.object.comments.all()
         return context
 
 
-def category_posts(request, category_slug):
-    template = 'blog/category.html'
-    category = get_object_or_404(
-        Category,
-        slug=category_slug,
-        is_published=True
-    )
-    post = get_visible_posts().filter(
-        category__slug=category_slug,
-    )
-    page_obj = make_paginate(request, post)
-    context = {
-        'category': category,
-        'page_obj': page_obj
-    }
-    return render(request, template, context)
+class CategoryPostsView(IndexListView):
+    template_name = 'blog/category.html'
+
+    def get_queryset(self):
+        self.category = get_object_or_404(
+            Category.objects.only('id', 'title', 'slug', 'description'),
+            slug=self.kwargs['category_slug'],
+            is_published=True
+        )
+        return super().get_queryset().filter(category=self.category)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['category'] = self.category
+        return context
 
 
 def profile(request, username):
     template = 'blog/profile.html'
     profile_user = get_object_or_404(User, username=username)
+    # Чужие посты в профиле всегда отфильтрованы по автору, поэтому условие
+    # «или автор — текущий пользователь» ничего не добавляет: гостям
+    # и другим пользователям хватает обычной публичной выборки.
     if request.user == profile_user or request.user.is_superuser:
-        post_list = profile_user.posts.annotate(
-            comment_count=Count('comments')).order_by('-pub_date')
+        post_list = base_posts()
     else:
-        post_list = visible_to_user(
-            request.user, get_object_or_404(User, username=username)).filter(
-                author=profile_user)
-    page_obj = make_paginate(request, post_list)
+        post_list = get_visible_posts()
+    page_obj = make_paginate(request, post_list.filter(author=profile_user))
     context = {
         'profile': profile_user,
         'page_obj': page_obj
@@ -141,7 +156,7 @@ class PostCreateView(LoginRequiredMixin, CreateView):
 def edit_profile(request):
     template = 'blog/user.html'
     if request.method == 'POST':
-        form = ProfileEditForm(request.POST or None, instance=request.user)
+        form = ProfileEditForm(request.POST, instance=request.user)
         if form.is_valid():
             form.save()
             return redirect('blog:profile', username=request.user.username)
@@ -152,16 +167,18 @@ def edit_profile(request):
 
 
 @login_required
+@require_POST
 def add_comment(request, post_id):
-    post = get_object_or_404(Post, pk=post_id)
-    if request.method == "POST":
-        form = CommentsForm(request.POST)
-        if form.is_valid():
-            comment = form.save(commit=False)
-            comment.author = request.user
-            comment.post = post
-            comment.save()
-            return redirect('blog:post_detail', pk=post_id)
+    # Для комментария нужен только id поста, сам пост не загружаем.
+    if not Post.objects.filter(pk=post_id).exists():
+        raise Http404
+    form = CommentsForm(request.POST)
+    if form.is_valid():
+        comment = form.save(commit=False)
+        comment.author = request.user
+        comment.post_id = post_id
+        comment.save()
+    return redirect('blog:post_detail', pk=post_id)
 
 
 class PostDeleteView(OnlyAuthorMixin, DeleteView):
@@ -175,10 +192,13 @@ def edit_comment(request, post_id, comment_id):
     comment = get_object_or_404(Comments, pk=comment_id)
     if comment.author != request.user:
         return redirect('blog:post_detail', pk=post_id)
-    form = CommentsForm(request.POST or None, instance=comment)
-    if form.is_valid():
-        form.save()
-        return redirect('blog:post_detail', pk=post_id)
+    if request.method == 'POST':
+        form = CommentsForm(request.POST, instance=comment)
+        if form.is_valid():
+            form.save()
+            return redirect('blog:post_detail', pk=post_id)
+    else:
+        form = CommentsForm(instance=comment)
 
     context = {
         'comment': comment,
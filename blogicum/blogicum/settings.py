@@ -139,12 +139,24 @@ STATICFILES_DIRS = [
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
+# Кеш страниц ленты (blog.paginator) сбрасывается сменой версии в кеше.
+# LocMemCache живёт внутри одного процесса, поэтому корректен только при
+# одном процессе сервера. При нескольких воркерах нужен общий кеш, например
+# 'django.core.cache.backends.redis.RedisCache' с LOCATION на Redis.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
 
 LOGIN_REDIRECT_URL = reverse_lazy('blog:index')
 
+LOGIN_URL = reverse_lazy('login')
+
 EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
 
 EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
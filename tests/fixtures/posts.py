@@ -97,6 +97,19 @@ def post_with_published_location(
     return post
 
 
+@pytest.fixture
+def visible_post(
+        mixer: Mixer, user, published_location, published_category):
+    return mixer.blend(
+        'blog.Post',
+        is_published=True,
+        location=published_location,
+        category=published_category,
+        author=user,
+        pub_date=timezone.now() - timedelta(hours=1),
+    )
+
+
 @pytest.fixture
 def many_posts_with_published_locations(
     mixer: Mixer, user, published_locations, published_category
@@ -0,0 +1,84 @@
+import pytest
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def two_posts(mixer, user):
+    return mixer.cycle(2).blend("blog.Post", author=user)
+
+
+def comment_counts(posts):
+    for post in posts:
+        post.refresh_from_db()
+    return [post.comment_count for post in posts]
+
+
+def test_create_and_delete(two_posts, mixer, user):
+    post, _ = two_posts
+    comments = mixer.cycle(2).blend("blog.Comments", post=post, author=user)
+    assert comment_counts(two_posts) == [2, 0]
+    comments[0].delete()
+    assert comment_counts(two_posts) == [1, 0]
+
+
+def test_move_to_another_post(two_posts, mixer, user):
+    first, second = two_posts
+    comment = mixer.blend("blog.Comments", post=first, author=user)
+    comment.post = second
+    comment.save()
+    assert comment_counts(two_posts) == [0, 1]
+    comment.delete()
+    assert comment_counts(two_posts) == [0, 0]
+
+
+def test_edit_text_keeps_count(two_posts, mixer, user):
+    post, _ = two_posts
+    comment = mixer.blend("blog.Comments", post=post, author=user)
+    comment.text = "Другой текст"
+    comment.save()
+    assert comment_counts(two_posts) == [1, 0]
+
+
+def test_delete_never_goes_below_zero(two_posts, mixer, user, PostModel):
+    post, _ = two_posts
+    comment = mixer.blend("blog.Comments", post=post, author=user)
+    PostModel.objects.filter(pk=post.pk).update(comment_count=0)
+    comment.delete()
+    assert comment_counts(two_posts) == [0, 0]
+
+
+def test_loaddata_keeps_count(
+        two_posts, mixer, user, PostModel, tmp_path
+):
+    post, _ = two_posts
+    mixer.blend("blog.Comments", post=post, author=user)
+    fixture = tmp_path / "posts.json"
+    call_command(
+        "dumpdata", "blog.Post", "blog.Comments", output=str(fixture)
+    )
+    PostModel.objects.filter(pk=post.pk).delete()
+    call_command("loaddata", str(fixture), verbosity=0)
+    assert comment_counts(two_posts) == [1, 0]
+
+
+def test_saving_outdated_post_keeps_count(
+        two_posts, mixer, user, PostModel
+):
+    post, _ = two_posts
+    outdated = PostModel.objects.get(pk=post.pk)
+    mixer.cycle(3).blend("blog.Comments", post=post, author=user)
+    outdated.title = "Заголовок после правки"
+    outdated.save()
+    assert comment_counts(two_posts) == [3, 0]
+    assert PostModel.objects.get(pk=post.pk).title == outdated.title
+
+
+def test_saving_post_without_loaded_count(two_posts, mixer, user, PostModel):
+    post, _ = two_posts
+    mixer.blend("blog.Comments", post=post, author=user)
+    partial = PostModel.objects.only("id", "title").get(pk=post.pk)
+    partial.title = "Частично загруженный пост"
+    partial.save()
+    assert comment_counts(two_posts) == [1, 0]
@@ -0,0 +1,46 @@
+from http import HTTPStatus
+
+import pytest
+
+pytestmark = [pytest.mark.django_db]
+
+ACTIONS = ("edit", "delete")
+
+
+@pytest.mark.parametrize("action", ACTIONS)
+def test_author_gets_form(visible_post, user_client, action):
+    response = user_client.get(f"/posts/{visible_post.id}/{action}/")
+    assert response.status_code == HTTPStatus.OK
+
+
+@pytest.mark.parametrize("action", ACTIONS)
+def test_not_author_is_redirected_to_post(
+        visible_post, another_user_client, PostModel, action
+):
+    for method in (another_user_client.get, another_user_client.post):
+        response = method(f"/posts/{visible_post.id}/{action}/")
+        assert response.status_code == HTTPStatus.FOUND
+        assert response.url == f"/posts/{visible_post.id}/"
+    assert PostModel.objects.filter(pk=visible_post.pk).exists()
+
+
+@pytest.mark.parametrize("action", ACTIONS)
+def test_anonymous_is_redirected_to_login(
+        visible_post, unlogged_client, action
+):
+    url = f"/posts/{visible_post.id}/{action}/"
+    response = unlogged_client.get(url)
+    assert response.status_code == HTTPStatus.FOUND
+    assert response.url == f"/auth/login/?next={url}"
+
+
+@pytest.mark.parametrize("action", ACTIONS)
+def test_missing_post_is_404(visible_post, user_client, action):
+    response = user_client.get(f"/posts/{visible_post.id + 1}/{action}/")
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+def test_author_can_delete(visible_post, user_client, PostModel):
+    response = user_client.post(f"/posts/{visible_post.id}/delete/")
+    assert response.status_code == HTTPStatus.FOUND
+    assert not PostModel.objects.filter(pk=visible_post.pk).exists()
@@ -0,0 +1,114 @@
+from datetime import timedelta
+from http import HTTPStatus
+from urllib.parse import parse_qsl, urlencode
+
+import pytest
+from django.utils import timezone
+
+from blog.models import Post
+from blog.paginator import KeysetPaginator
+
+pytestmark = [pytest.mark.django_db]
+
+PER_PAGE = 3
+
+
+@pytest.fixture
+def keyset_posts(mixer, user, published_category):
+    # Часть постов с одинаковой датой, чтобы порядок решал tiebreak по pk.
+    now = timezone.now()
+    pub_dates = [now - timedelta(hours=1)] * 4 + [
+        now - timedelta(hours=hours) for hours in range(2, 6)
+    ]
+    return mixer.cycle(len(pub_dates)).blend(
+        "blog.Post",
+        author=user,
+        category=published_category,
+        is_published=True,
+        pub_date=(pub_date for pub_date in pub_dates),
+    )
+
+
+def expected_order(posts):
+    return sorted(posts, key=lambda post: (post.pub_date, post.pk),
+                  reverse=True)
+
+
+def get_page(params=None):
+    paginator = KeysetPaginator(Post.objects.all(), PER_PAGE)
+    return paginator.get_page(params or {})
+
+
+def test_before_walks_through_all_posts(keyset_posts):
+    pages = []
+    page = get_page()
+    assert not page.has_previous()
+    while True:
+        pages.append(list(page))
+        if not page.has_next():
+            break
+        page = get_page(dict(parse_qsl(page.next_page_query())))
+        assert page.has_previous()
+    assert [len(posts) for posts in pages] == [3, 3, 2]
+    assert sum(pages, []) == expected_order(keyset_posts)
+
+
+def test_tiebreak_splits_equal_pub_dates(keyset_posts):
+    first_page = get_page()
+    assert len({post.pub_date for post in first_page}) == 1
+    second_page = get_page(dict(parse_qsl(first_page.next_page_query())))
+    assert second_page[0].pub_date == first_page[-1].pub_date
+    assert second_page[0].pk < first_page[-1].pk
+
+
+def test_after_returns_previous_page(keyset_posts):
+    first_page = get_page()
+    second_page = get_page(dict(parse_qsl(first_page.next_page_query())))
+    previous_page = get_page(
+        dict(parse_qsl(second_page.previous_page_query()))
+    )
+    assert list(previous_page) == list(first_page)
+    assert previous_page.has_next()
+    assert not previous_page.has_previous()
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "before=not-a-date&tiebreak=1",
+        "before=2020-13-40T00:00:00&tiebreak=1",
+        "before=2020-01-01T00:00:00%2B00:00&tiebreak=%C2%B2",
+        "before=2020-01-01T00:00:00%2B00:00&tiebreak=",
+        "after=9999-12-31T23:59:59-05:00&tiebreak=1",
+        "before=0001-01-01T00:00:00%2B05:00&tiebreak=1",
+    ],
+)
+def test_invalid_cursor_shows_first_page(keyset_posts, client, query):
+    response = client.get(f"/?{query}")
+    assert response.status_code == HTTPStatus.OK
+    assert list(response.context["page_obj"]) == (
+        expected_order(keyset_posts)[:10]
+    )
+
+
+def test_after_newest_post_falls_back_to_first_page(keyset_posts, client):
+    newest = expected_order(keyset_posts)[0]
+    query = urlencode({
+        "after": newest.pub_date.isoformat(), "tiebreak": newest.pk
+    })
+    response = client.get(f"/?{query}")
+    assert list(response.context["page_obj"]) == (
+        expected_order(keyset_posts)[:10]
+    )
+
+
+def test_before_past_the_end_falls_back_to_first_page(keyset_posts):
+    page = get_page()
+    while page.has_next():
+        page = get_page(dict(parse_qsl(page.next_page_query())))
+    last_page_query = dict(parse_qsl(page.previous_page_query()))
+    last_page_query["before"] = last_page_query.pop("after")
+    Post.objects.filter(pk__in=[post.pk for post in page]).delete()
+    stale_page = get_page(last_page_query)
+    assert list(stale_page) == expected_order(keyset_posts)[:PER_PAGE]
+    assert not stale_page.has_previous()
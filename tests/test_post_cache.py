@@ -0,0 +1,81 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def cached_post(visible_post, client):
+    client.get("/")
+    return visible_post
+
+
+def index_content(client):
+    return client.get("/").content.decode("utf-8")
+
+
+def test_index_is_served_from_cache(
+        cached_post, client, django_assert_num_queries
+):
+    with django_assert_num_queries(0):
+        client.get("/")
+
+
+def test_post_change_resets_cache(cached_post, client):
+    cached_post.title = "Заголовок после правки"
+    cached_post.save()
+    assert "Заголовок после правки" in index_content(client)
+
+
+def test_category_change_resets_cache(cached_post, client):
+    category = cached_post.category
+    category.title = "Категория после правки"
+    category.save()
+    assert "Категория после правки" in index_content(client)
+
+
+def test_location_change_resets_cache(cached_post, client):
+    location = cached_post.location
+    location.name = "Место после правки"
+    location.save()
+    assert "Место после правки" in index_content(client)
+
+
+def test_comment_resets_cache(cached_post, client, mixer):
+    mixer.blend("blog.Comments", post=cached_post, author=cached_post.author)
+    assert "Комментарии (1)" in index_content(client)
+
+
+def test_username_change_resets_cache(cached_post, client):
+    author = cached_post.author
+    old_username = author.username
+    author.username = f"{old_username}_renamed"
+    author.save()
+    content = index_content(client)
+    assert f"/profile/{old_username}_renamed/" in content
+    assert f"/profile/{old_username}/" not in content
+
+
+def test_login_keeps_cache(cached_post, client, django_assert_num_queries):
+    client.force_login(cached_post.author)
+    client.logout()
+    with django_assert_num_queries(0):
+        client.get("/")
+
+
+
+def test_cache_is_reset_again_after_commit(
+        cached_post, client, django_capture_on_commit_callbacks
+):
+    with django_capture_on_commit_callbacks() as callbacks:
+        cached_post.title = "Заголовок после правки"
+        cached_post.save()
+    # Страница, закешированная до коммита, должна сброситься после него.
+    client.get("/")
+    assert callbacks
+    for callback in callbacks:
+        callback()
+    with CaptureQueriesContext(connection) as queries:
+        client.get("/")
+    assert len(queries) == 1
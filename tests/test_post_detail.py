@@ -0,0 +1,24 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_post_published_this_minute_is_visible(visible_post, unlogged_client):
+    visible_post.pub_date = timezone.now() - timedelta(seconds=1)
+    visible_post.save()
+    response = unlogged_client.get(f"/posts/{visible_post.id}/")
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_future_post_is_hidden_from_others(
+        visible_post, unlogged_client, user_client
+):
+    visible_post.pub_date = timezone.now() + timedelta(minutes=5)
+    visible_post.save()
+    url = f"/posts/{visible_post.id}/"
+    assert unlogged_client.get(url).status_code == HTTPStatus.NOT_FOUND
+    assert user_client.get(url).status_code == HTTPStatus.OK